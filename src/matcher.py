@@ -1,12 +1,11 @@
 import sys
+from collections import deque
 
 def parse_input(filename):
 	try:
+		#strip whitespace and remove empty lines in a single pass
 		with open(filename, 'r') as f:
-			lines = f.readlines()
-
-		#strip whitespace and remove empty lines
-		lines = [line.strip() for line in lines if line.strip()]
+			lines = [line for line in map(str.strip, f) if line]
 
 		if len(lines) == 0:
 			raise ValueError("Input file is empty")
@@ -24,6 +23,9 @@ def parse_input(filename):
 		if len(lines) < 1 + 2 * n:
 			raise ValueError(f"Expected {1 + 2*n} lines, but got {len(lines)}")
 
+		#every preference list must contain exactly these ids
+		expected = set(range(1, n+1))
+
 		#next n lines: hospital preference lists
 		hospital_prefs = []
 		for i in range(1, n+1):
@@ -32,8 +34,8 @@ def parse_input(filename):
 				raise ValueError(f"Hospital {i} preference list expected {n} students, but has {len(prefs)}")
 
 			#validate that list is a permutation of 1..n
-			if sorted(prefs) != list(range(1, n+1)):
-				raise ValueError(f"Hospital {1} preference list is not a valid permutation of 1..{n}")
+			if set(prefs) != expected:
+				raise ValueError(f"Hospital {i} preference list is not a valid permutation of 1..{n}")
 
 			hospital_prefs.append(prefs)
 
@@ -45,7 +47,7 @@ def parse_input(filename):
 				raise ValueError(f"Student {i-n} preference list expected {n}, but has {len(prefs)}")
 
 			#validate that list is permutation of 1..n
-			if sorted(prefs) != list(range(1, n+1)):
+			if set(prefs) != expected:
 				raise ValueError(f"Students {i-n} preference list is not a valid permutation of 1..{n}")
 
 			student_prefs.append(prefs)
@@ -60,10 +62,10 @@ def parse_input(filename):
 
 def write_output(matching, filename):
 	try:
+		#matching[h] = student of hospital h, already in hospital order, so write once
+		lines = [f"{hospital} {matching[hospital]}\n" for hospital in range(1, len(matching))]
 		with open(filename, 'w') as f:
-			#sort by hospital number
-			for hospital in sorted(matching.keys()):
-				f.write(f"{hospital} {matching[hospital]}\n")
+			f.write("".join(lines))
 		print(f"Output written to {filename}")
 	except Exception as e:
 		raise Exception(f"Error writing output: {e}")
@@ -73,62 +75,68 @@ def gale_shapley(hospital_prefs, student_prefs):
 
 	#edge case: n = 0
 	if n == 0:
-		return {}, 0
+		return [0], 0
 
-	#hospital_match[h] = student that hospital h is matched to (none if unmatched)
-	hospital_match = {h: None for h in range(1, n+1)}
+	#hospital_match[h] = student that hospital h is matched to (0 if unmatched)
+	#lists are indexed by id, slot 0 is unused
+	hospital_match = [0] * (n+1)
 
-	#student_match[s] = hospital that student s is matched to (none if unmatched)
-	student_match = {s: None for s in range(1, n+1)}
+	#student_match[s] = hospital that student s is matched to (0 if unmatched)
+	student_match = [0] * (n+1)
 
 	#next_proposal[h] = index of next student on hospital h's list to propose to
-	next_proposal = {h: 0 for h in range(1, n+1)}
+	next_proposal = [0] * (n+1)
 
-	#ranking dictionary for effective lookup
-	#student_ranking[s][h] = rank of hospital h in student s's preference list (lower is better)
-	student_ranking = {}
-	for s in range(1, n+1):
-		student_ranking[s] = {}
-		for rank, hospital in enumerate(student_prefs[s-1]):
-			student_ranking[s][hospital] = rank
+	#flat ranking table for effective lookup
+	#rank[(s-1)*n + (h-1)] = rank of hospital h in student s's preference list (lower is better)
+	rank = [0] * (n*n)
+	for s, prefs in enumerate(student_prefs):
+		row = s*n - 1
+		for r, hospital in enumerate(prefs):
+			rank[row + hospital] = r
 
 	#track proposals
 	num_proposals = 0
 
-	#while there is hospitals with students to propose to
-	while True:
-		#find an unmatched hospital
-		free_hospital = None
-		for h in range(1, n+1):
-			if hospital_match[h] is None and next_proposal[h] < n:
-				free_hospital = h
-				break
+	#queue of hospitals that are unmatched
+	free = deque(range(1, n+1))
 
-		#if no unmatched hospitals, we're done
-		if free_hospital is None:
-			break
+	#bind queue methods locally, the loop below runs once per proposal
+	pop_free = free.popleft
+	push_free = free.append
+
+	#while there is unmatched hospitals
+	#preference lists are complete, so a free hospital always has a student left:
+	#if all n students had rejected it, n students would be held by n-1 hospitals
+	while free:
+		free_hospital = pop_free()
 
 		#get the next student the hospital should propose to
-		student = hospital_prefs[free_hospital - 1][next_proposal[free_hospital]]
-		next_proposal[free_hospital] += 1
+		k = next_proposal[free_hospital]
+		student = hospital_prefs[free_hospital - 1][k]
+		next_proposal[free_hospital] = k + 1
 		num_proposals += 1
 
 		#if student is unmatched, accept
-		if student_match[student] is None:
+		current_hospital = student_match[student]
+		if not current_hospital:
 			hospital_match[free_hospital] = student
 			student_match[student] = free_hospital
 		else:
 			#if student is matched, compare current match with the new proposer
-			current_hospital = student_match[student]
-
-			#if student prefers the hospital with lower rank in their preference list
-			if student_ranking[student][free_hospital] < student_ranking[student][current_hospital]:
+			#student prefers the hospital with lower rank in their preference list
+			row = (student - 1) * n - 1
+			if rank[row + free_hospital] < rank[row + current_hospital]:
 				#swap matches
-				hospital_match[current_hospital] = None #reject current match
+				hospital_match[current_hospital] = 0 #reject current match
 				hospital_match[free_hospital] = student
 				student_match[student] = free_hospital
-			#else: student prefers current match, reject the new proposer (do nothing)
+				push_free(current_hospital)
+			else:
+				#student prefers current match, reject the new proposer
+				push_free(free_hospital)
 
+	#hospital_match[h] for h in 1..n is the matching, slot 0 is unused
 	return hospital_match, num_proposals
 
 def main():
@@ -4,66 +4,52 @@ Scalability Testing for Stable Matching
 Measures running time of matcher and verifier for increasing n values.
 """
 
-import subprocess
+import contextlib
+import io
 import time
 import os
-import sys
-import random
-import matplotlib.pyplot as plt
+import numpy as np
+
+import matcher
+import verifier
 
 
 def generate_test_input(n, filename, seed=42):
-    random.seed(seed + n)
+    rng = np.random.default_rng(seed + n)
+    
+    # 2n rows, each an independent shuffle of 1..n:
+    # the first n are hospital preferences, the last n student preferences
+    prefs = rng.permuted(np.tile(np.arange(1, n + 1), (2 * n, 1)), axis=1)
     
     with open(filename, 'w') as f:
         f.write(f"{n}\n")
-        
-        students = list(range(1, n + 1))
-        hospitals = list(range(1, n + 1))
-        
-        for _ in range(n):
-            pref = students.copy()
-            random.shuffle(pref)
-            f.write(" ".join(map(str, pref)) + "\n")
-        
-        for _ in range(n):
-            pref = hospitals.copy()
-            random.shuffle(pref)
-            f.write(" ".join(map(str, pref)) + "\n")
+        np.savetxt(f, prefs, fmt='%d')
 
 
-def time_matcher(matcher_script, input_file, output_file, runs=3):
+def time_matcher(hospital_prefs, student_prefs, runs=3):
     times = []
     for _ in range(runs):
         start = time.perf_counter()
-        result = subprocess.run(
-            ["python", matcher_script, input_file, output_file],
-            capture_output=True, text=True
-        )
+        matching, _ = matcher.gale_shapley(hospital_prefs, student_prefs)
         end = time.perf_counter()
-        
-        if result.returncode != 0:
-            return None
         times.append(end - start)
     
-    return sum(times) / len(times)
+    return sum(times) / len(times), matching
 
 
-def time_verifier(verifier_script, pref_file, matching_file, runs=3):
+def time_verifier(n, matching, hospital_prefs, student_prefs, runs=3):
     times = []
     for _ in range(runs):
         start = time.perf_counter()
-        result = subprocess.run(
-            ["python", verifier_script, pref_file, matching_file],
-            capture_output=True, text=True
-        )
+        verifier.check_validity(n, matching)
+        verifier.check_stability(n, matching, hospital_prefs, student_prefs)
         end = time.perf_counter()
         times.append(end - start)
     
     return sum(times) / len(times)
 
 
-def run_scalability_tests(matcher_script, verifier_script, output_dir="scalability_results"):
+def run_scalability_tests(output_dir="scalability_results"):
     os.makedirs(output_dir, exist_ok=True)
     
     sizes = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
@@ -82,13 +68,23 @@ def run_scalability_tests(matcher_script, verifier_script, output_dir="scalabili
         
         generate_test_input(n, input_file)
         
-        matcher_time = time_matcher(matcher_script, input_file, output_file)
-        if matcher_time is not None:
-            matcher_times.append((n, matcher_time))
+        # Parse once; the matcher and verifier share the parsed preferences
+        # and the matching is handed over in memory, only the algorithms are timed
+        n, hospital_prefs, student_prefs = matcher.parse_input(input_file)
+        
+        matcher_time, matching = time_matcher(hospital_prefs, student_prefs)
+        matcher_times.append((n, matcher_time))
         
-        if os.path.exists(output_file):
-            verifier_time = time_verifier(verifier_script, input_file, output_file)
-            verifier_times.append((n, verifier_time))
+        # write_output reports the file it wrote, keep the progress line clean
+        with contextlib.redirect_stdout(io.StringIO()):
+            matcher.write_output(matching, output_file)
+        
+        # The verifier indexes preferences by id (1..n), the matching already is
+        verifier_time = time_verifier(
+            n, matching,
+            dict(enumerate(hospital_prefs, 1)), dict(enumerate(student_prefs, 1))
+        )
+        verifier_times.append((n, verifier_time))
         
         print(f"Matcher: {matcher_time*1000:.1f}ms, Verifier: {verifier_time*1000:.1f}ms")
     
@@ -96,11 +92,16 @@ def run_scalability_tests(matcher_script, verifier_script, output_dir="scalabili
 
 
 def create_graphs(matcher_times, verifier_times, output_dir="scalability_results"):
+    # Imported here so timing runs don't pay for it; Agg skips GUI backend setup
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
     fig, axes = plt.subplots(1, 2, figsize=(14, 5))
     
     if matcher_times:
-        ns, times = zip(*matcher_times)
-        axes[0].plot(ns, [t * 1000 for t in times], 'b-o', linewidth=2, markersize=8)
+        ns, times = np.asarray(matcher_times).T
+        axes[0].plot(ns, times * 1000.0, 'b-o', linewidth=2, markersize=8)
         axes[0].set_xlabel('n (number of hospitals/students)')
         axes[0].set_ylabel('Running Time (ms)')
         axes[0].set_title('Matcher (Gale-Shapley) Running Time')
@@ -108,8 +109,8 @@ def create_graphs(matcher_times, verifier_times, output_dir="scalability_results
         axes[0].set_xscale('log', base=2)
     
     if verifier_times:
-        ns, times = zip(*verifier_times)
-        axes[1].plot(ns, [t * 1000 for t in times], 'r-o', linewidth=2, markersize=8)
+        ns, times = np.asarray(verifier_times).T
+        axes[1].plot(ns, times * 1000.0, 'r-o', linewidth=2, markersize=8)
         axes[1].set_xlabel('n (number of hospitals/students)')
         axes[1].set_ylabel('Running Time (ms)')
         axes[1].set_title('Verifier Running Time')
@@ -141,28 +142,11 @@ def save_results(matcher_times, verifier_times, output_dir="scalability_results"
 
 
 def main():
+    # scalability.py lives in src/, results go next to it at the repo root
     script_dir = os.path.dirname(os.path.abspath(__file__))
+    output_dir = os.path.join(os.path.dirname(script_dir), "scalability_results")
     
-    if os.path.basename(script_dir) == "src":
-        base_dir = os.path.dirname(script_dir)
-        matcher_script = os.path.join(script_dir, "matcher.py")
-        verifier_script = os.path.join(script_dir, "verifier.py")
-        output_dir = os.path.join(base_dir, "scalability_results")
-    else:
-        matcher_script = os.path.join(script_dir, "src", "matcher.py")
-        verifier_script = os.path.join(script_dir, "src", "verifier.py")
-        output_dir = os.path.join(script_dir, "scalability_results")
-    
-    if not os.path.exists(matcher_script):
-        print(f"Error: Matcher not found: {matcher_script}")
-        sys.exit(1)
-    if not os.path.exists(verifier_script):
-        print(f"Error: Verifier not found: {verifier_script}")
-        sys.exit(1)
-    
-    sizes, matcher_times, verifier_times = run_scalability_tests(
-        matcher_script, verifier_script, output_dir
-    )
+    sizes, matcher_times, verifier_times = run_scalability_tests(output_dir)
     
     save_results(matcher_times, verifier_times, output_dir)
     create_graphs(matcher_times, verifier_times, output_dir)
@@ -17,48 +17,58 @@ def parse_preferences(filename):
     student_prefs[s] = list of hospitals in order of preference (1-indexed)
     """
     with open(filename, 'r') as f:
-        lines = [line.strip() for line in f if line.strip()]
-    
-    n = int(lines[0])
-    
-    if n == 0:
-        return 0, {}, {}
-    
-    # Validate we have enough lines
-    if len(lines) != 2 * n + 1:
-        raise ValueError(f"Expected {2*n + 1} lines, got {len(lines)}")
-    
-    hospital_prefs = {}
-    student_prefs = {}
-    
-    # Parse hospital preferences (lines 1 to n)
-    for i in range(1, n + 1):
-        prefs = list(map(int, lines[i].split()))
-        if len(prefs) != n:
-            raise ValueError(f"Hospital {i} has {len(prefs)} preferences, expected {n}")
-        if sorted(prefs) != list(range(1, n + 1)):
-            raise ValueError(f"Hospital {i} preferences must be a permutation of 1..{n}")
-        hospital_prefs[i] = prefs
-    
-    # Parse student preferences (lines n+1 to 2n)
-    for i in range(n + 1, 2 * n + 1):
-        student_id = i - n
-        prefs = list(map(int, lines[i].split()))
-        if len(prefs) != n:
-            raise ValueError(f"Student {student_id} has {len(prefs)} preferences, expected {n}")
-        if sorted(prefs) != list(range(1, n + 1)):
-            raise ValueError(f"Student {student_id} preferences must be a permutation of 1..{n}")
-        student_prefs[student_id] = prefs
+        # Stream the non-empty lines, each row is parsed as it is read
+        lines = (line for line in map(str.strip, f) if line)
+        
+        header = next(lines, None)
+        if header is None:
+            raise ValueError("Preference file is empty")
+        n = int(header)
+        
+        if n == 0:
+            return 0, {}, {}
+        
+        hospital_prefs = {}
+        student_prefs = {}
+        
+        # Every preference list must contain exactly these ids, built once a
+        # row has the right length so a bogus header fails before allocating
+        expected = None
+        
+        # Parse hospital preferences (lines 1 to n)
+        for i, line in zip(range(1, n + 1), lines):
+            prefs = list(map(int, line.split()))
+            if len(prefs) != n:
+                raise ValueError(f"Hospital {i} has {len(prefs)} preferences, expected {n}")
+            if expected is None:
+                expected = set(range(1, n + 1))
+            if set(prefs) != expected:
+                raise ValueError(f"Hospital {i} preferences must be a permutation of 1..{n}")
+            hospital_prefs[i] = prefs
+        
+        # Parse student preferences (lines n+1 to 2n)
+        for student_id, line in zip(range(1, n + 1), lines):
+            prefs = list(map(int, line.split()))
+            if len(prefs) != n:
+                raise ValueError(f"Student {student_id} has {len(prefs)} preferences, expected {n}")
+            if set(prefs) != expected:
+                raise ValueError(f"Student {student_id} preferences must be a permutation of 1..{n}")
+            student_prefs[student_id] = prefs
+        
+        # Validate we have exactly 2n + 1 lines
+        count = 1 + len(hospital_prefs) + len(student_prefs) + sum(1 for _ in lines)
+        if count != 2 * n + 1:
+            raise ValueError(f"Expected {2*n + 1} lines, got {count}")
     
     return n, hospital_prefs, student_prefs
 
 
-def parse_matching(filename):
+def parse_matching(filename, n):
     """
     Parse the matching output file.
-    Returns: dict mapping hospital -> student
+    Returns: list where matching[h] = student matched to hospital h (0 if none)
     """
-    matching = {}
+    matching = [0] * (n + 1)
     with open(filename, 'r') as f:
         for line in f:
             line = line.strip()
@@ -67,6 +77,12 @@ def parse_matching(filename):
                 if len(parts) != 2:
                     raise ValueError(f"Invalid matching line: {line}")
                 hospital, student = int(parts[0]), int(parts[1])
+                if not 1 <= hospital <= n:
+                    raise ValueError(f"Hospital {hospital} is not in 1..{n}")
+                if not 1 <= student <= n:
+                    raise ValueError(f"Student {student} is not in 1..{n}")
+                if matching[hospital]:
+                    raise ValueError(f"Hospital {hospital} is matched more than once")
                 matching[hospital] = student
     return matching
 
@@ -78,61 +94,46 @@ def check_validity(n, matching):
     - Each student 1..n is matched exactly once
     - No duplicates
     
+    Expects matching as returned by parse_matching, which already rejects
+    hospitals and students outside 1..n.
+    
     Returns: (is_valid, error_message or None)
     """
     if n == 0:
-        if len(matching) == 0:
-            return True, None
-        else:
-            return False, "Expected empty matching for n=0"
+        return True, None
     
     # Check all hospitals are present
-    hospitals_in_matching = set(matching.keys())
-    expected_hospitals = set(range(1, n + 1))
-    
-    if hospitals_in_matching != expected_hospitals:
-        missing = expected_hospitals - hospitals_in_matching
-        extra = hospitals_in_matching - expected_hospitals
-        msg = ""
-        if missing:
-            msg += f"Missing hospitals: {missing}. "
-        if extra:
-            msg += f"Extra hospitals: {extra}."
-        return False, msg.strip()
-    
-    # Check all students are present and no duplicates
-    students_in_matching = list(matching.values())
-    expected_students = set(range(1, n + 1))
-    
-    if len(students_in_matching) != len(set(students_in_matching)):
-        # Find duplicates
-        seen = set()
-        duplicates = set()
-        for s in students_in_matching:
-            if s in seen:
-                duplicates.add(s)
-            seen.add(s)
-        return False, f"Duplicate students in matching: {duplicates}"
-    
-    if set(students_in_matching) != expected_students:
-        missing = expected_students - set(students_in_matching)
-        extra = set(students_in_matching) - expected_students
-        msg = ""
-        if missing:
-            msg += f"Missing students: {missing}. "
-        if extra:
-            msg += f"Extra students: {extra}."
-        return False, msg.strip()
+    missing = {h for h in range(1, n + 1) if not matching[h]}
+    if missing:
+        return False, f"Missing hospitals: {missing}."
     
-    return True, None
+    # n students all in 1..n, so they cover 1..n exactly when none repeats
+    students_in_matching = matching[1:]
+    if len(set(students_in_matching)) == n:
+        return True, None
+    
+    # Find duplicates
+    seen = set()
+    duplicates = set()
+    for s in students_in_matching:
+        if s in seen:
+            duplicates.add(s)
+        seen.add(s)
+    return False, f"Duplicate students in matching: {duplicates}"
 
 
-def get_rank(pref_list, item):
+def build_ranks(n, prefs):
     """
-    Get the rank (0-indexed) of item in preference list.
+    Build the inverse of each preference list.
+    Returns: ranks where ranks[x][y] is the rank (0-indexed) of y in x's list.
     Lower rank = more preferred.
     """
-    return pref_list.index(item)
+    ranks = [[0] * (n + 1) for _ in range(n + 1)]
+    for x in range(1, n + 1):
+        row = ranks[x]
+        for i, y in enumerate(prefs[x]):
+            row[y] = i
+    return ranks
 
 
 def check_stability(n, matching, hospital_prefs, student_prefs):
@@ -143,31 +144,25 @@ def check_stability(n, matching, hospital_prefs, student_prefs):
     if n == 0:
         return True, None
     
-    # Create reverse mapping: student -> hospital
-    student_to_hospital = {s: h for h, s in matching.items()}
+    # Precompute ranks so every lookup below is O(1)
+    srank = build_ranks(n, student_prefs)
+    
+    # s_current_rank[s] = rank of student s's current hospital in their list
+    s_current_rank = [0] * (n + 1)
+    for h in range(1, n + 1):
+        s = matching[h]
+        s_current_rank[s] = srank[s][h]
     
-    # Check every possible (hospital, student) pair
     for h in range(1, n + 1):
-        current_student = matching[h]
-        h_current_rank = get_rank(hospital_prefs[h], current_student)
+        # Only students h ranks above its current match can block
+        prefs = hospital_prefs[h]
+        preferred = prefs[:prefs.index(matching[h])]
         
-        for s in range(1, n + 1):
-            if s == current_student:
-                continue  # Already matched
-            
-            # Does h prefer s over current match?
-            h_pref_for_s = get_rank(hospital_prefs[h], s)
-            if h_pref_for_s >= h_current_rank:
-                continue  # h doesn't prefer s over current match
-            
-            # Does s prefer h over their current match?
-            current_hospital = student_to_hospital[s]
-            s_current_rank = get_rank(student_prefs[s], current_hospital)
-            s_pref_for_h = get_rank(student_prefs[s], h)
-            
-            if s_pref_for_h < s_current_rank:
-                # Blocking pair found!
-                return False, (h, s)
+        # Of those, s blocks if s also prefers h over their current match
+        blocking = [s for s in preferred if srank[s][h] < s_current_rank[s]]
+        if blocking:
+            # Report the lowest numbered student, as a full scan would
+            return False, (h, min(blocking))
     
     return True, None
 
@@ -182,7 +177,7 @@ def verify(pref_file, matching_file):
         return f"INVALID: Error parsing preferences - {e}", False, False
     
     try:
-        matching = parse_matching(matching_file)
+        matching = parse_matching(matching_file, n)
     except Exception as e:
         return f"INVALID: Error parsing matching - {e}", False, False
     